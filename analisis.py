@@ -0,0 +1,202 @@
+import zlib
+import random
+import threading
+from array import array
+from collections import Counter
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Tuple
+from carton import Carton
+
+PRIMO = (1 << 61) - 1
+UMBRAL_SIMILITUD = 0.8
+NUM_PERMUTACIONES = 128
+BANDAS = 16
+BITS_VALOR = 16
+BITS_CAMPO = BITS_VALOR + 1
+MASCARA_CLAVE = (1 << 30) - 1
+
+
+def jaccard(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    conjunto_a = set(a)
+    interseccion = len(conjunto_a.intersection(b))
+    union = len(conjunto_a) + len(b) - interseccion
+    return interseccion / union if union else 1.0
+
+
+class IndiceMinHash:
+    def __init__(self, num_permutaciones: int = NUM_PERMUTACIONES, bandas: int = BANDAS, semilla: int = 0):
+        if num_permutaciones % bandas != 0:
+            raise ValueError("num_permutaciones debe ser múltiplo de bandas")
+        if (num_permutaciones // bandas * BITS_CAMPO) % 8 != 0:
+            raise ValueError("cada banda debe ocupar un número entero de bytes")
+        rng = random.Random(semilla)
+        self.coeficientes = [(rng.randrange(1, PRIMO), rng.randrange(PRIMO)) for _ in range(num_permutaciones)]
+        self.bandas = bandas
+        self.filas = num_permutaciones // bandas
+        self.bytes_banda = self.filas * BITS_CAMPO // 8
+        self._hashes: Dict[int, int] = {}
+        self._minimo = self._crear_minimo(sum(1 << (BITS_CAMPO * j + BITS_VALOR) for j in range(num_permutaciones)))
+
+    def _hashes_palabra(self, id_palabra: int) -> int:
+        empaquetado = 0
+        for j, (a, b) in enumerate(self.coeficientes):
+            empaquetado |= ((a * id_palabra + b) % PRIMO >> (61 - BITS_VALOR)) << (BITS_CAMPO * j)
+        self._hashes[id_palabra] = empaquetado
+        return empaquetado
+
+    @staticmethod
+    def _crear_minimo(guardas: int):
+        def minimo(a: int, b: int, desplazamiento: int = BITS_VALOR) -> int:
+            mayores = ((a | guardas) - b) & guardas
+            mascara = mayores - (mayores >> desplazamiento)
+            return (b & mascara) | (a & ~mascara)
+        return minimo
+
+    def firma(self, palabras: Tuple[int, ...]) -> int:
+        hashes = self._hashes
+        try:
+            return reduce(self._minimo, [hashes[p] for p in palabras])
+        except KeyError:
+            return reduce(self._minimo, [hashes.get(p) or self._hashes_palabra(p) for p in palabras])
+
+    def firmas(self, conjuntos: Iterable[Tuple[int, ...]]) -> List[int]:
+        return [self.firma(palabras) for palabras in conjuntos]
+
+    def claves_bandas(self, firma: int) -> List[int]:
+        tamano = self.bytes_banda
+        datos = firma.to_bytes(tamano * self.bandas, "little")
+        return [zlib.crc32(datos[i:i + tamano]) & MASCARA_CLAVE for i in range(0, len(datos), tamano)]
+
+
+class _TablaCubetas:
+    def __init__(self, capacidad: int = 1024):
+        self.claves = array('I', bytes(4 * capacidad))
+        self.cabezas = array('i', bytes(4 * capacidad))
+        self.mascara = capacidad - 1
+        self.limite = 2 * capacidad // 3
+        self.ocupadas = 0
+
+    def insertar(self, clave: int, indice: int) -> int:
+        if self.ocupadas >= self.limite:
+            self.reservar(self.ocupadas + 1)
+        claves = self.claves
+        marca = clave + 1
+        ranura = clave & self.mascara
+        actual = claves[ranura]
+        while actual and actual != marca:
+            ranura = (ranura + 1) & self.mascara
+            actual = claves[ranura]
+        if actual:
+            anterior = self.cabezas[ranura]
+        else:
+            claves[ranura] = marca
+            self.ocupadas += 1
+            anterior = -1
+        self.cabezas[ranura] = indice
+        return anterior
+
+    def reservar(self, cantidad: int):
+        capacidad = len(self.claves)
+        while 2 * capacidad // 3 < cantidad:
+            capacidad *= 2
+        if capacidad == len(self.claves):
+            return
+        claves = array('I', bytes(4 * capacidad))
+        cabezas = array('i', bytes(4 * capacidad))
+        mascara = capacidad - 1
+        for marca, cabeza in zip(self.claves, self.cabezas):
+            if marca:
+                ranura = (marca - 1) & mascara
+                while claves[ranura]:
+                    ranura = (ranura + 1) & mascara
+                claves[ranura] = marca
+                cabezas[ranura] = cabeza
+        self.claves = claves
+        self.cabezas = cabezas
+        self.mascara = mascara
+        self.limite = 2 * capacidad // 3
+
+
+class IndiceSolapamiento:
+    def __init__(self, umbral: float = UMBRAL_SIMILITUD, num_permutaciones: int = NUM_PERMUTACIONES,
+                 bandas: int = BANDAS, semilla: int = 0):
+        self.umbral = umbral
+        self.minhash = IndiceMinHash(num_permutaciones, bandas, semilla)
+        self.similares: List[Tuple[str, str, float]] = []
+        self._grupos: Dict[str, Dict[Tuple[int, ...], str]] = {}
+        self._duplicados: Dict[str, Dict[Tuple[int, ...], List[str]]] = {}
+        self._conjuntos: Dict[str, List[Tuple[int, ...]]] = {}
+        self._tablas: Dict[str, List[_TablaCubetas]] = {}
+        self._siguientes: Dict[str, array] = {}
+        self._cerrojo = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(grupos) for grupos in self._grupos.values())
+
+    def _tablas_idioma(self, idioma: str) -> List[_TablaCubetas]:
+        tablas = self._tablas.get(idioma)
+        if tablas is None:
+            tablas = self._tablas[idioma] = [_TablaCubetas() for _ in range(self.minhash.bandas)]
+        return tablas
+
+    def _registrar(self, idioma: str, id_carton: str, palabras: Tuple[int, ...],
+                   claves: Optional[List[int]]) -> Optional[Tuple[int, ...]]:
+        grupos = self._grupos.setdefault(idioma, {})
+        primero = grupos.get(palabras)
+        if primero is not None:
+            self._duplicados.setdefault(idioma, {}).setdefault(palabras, [primero]).append(id_carton)
+            return None
+        grupos[palabras] = id_carton
+        conjuntos = self._conjuntos.setdefault(idioma, [])
+        indice = len(conjuntos)
+        conjuntos.append(palabras)
+        bandas = self.minhash.bandas
+        tablas = self._tablas_idioma(idioma)
+        siguientes = self._siguientes.setdefault(idioma, array('i'))
+        if claves is None:
+            claves = self.minhash.claves_bandas(self.minhash.firma(palabras))
+        candidatos = set()
+        for banda, (tabla, clave) in enumerate(zip(tablas, claves)):
+            anterior = tabla.insertar(clave, indice)
+            siguientes.append(anterior)
+            while anterior >= 0:
+                candidatos.add(anterior)
+                anterior = siguientes[anterior * bandas + banda]
+        conjunto = set(palabras)
+        for candidato in sorted(candidatos):
+            otro = conjuntos[candidato]
+            interseccion = len(conjunto.intersection(otro))
+            similitud = interseccion / (len(conjunto) + len(otro) - interseccion)
+            if similitud >= self.umbral:
+                self.similares.append((grupos[otro], id_carton, similitud))
+        return palabras
+
+    def agregar_claves(self, entradas: Iterable[Tuple[str, str, Tuple[int, ...], Optional[List[int]]]]) -> int:
+        nuevos = 0
+        entradas = list(entradas)
+        with self._cerrojo:
+            for idioma, cantidad in Counter(entrada[0] for entrada in entradas).items():
+                tablas = self._tablas_idioma(idioma)
+                for tabla in tablas:
+                    tabla.reservar(tabla.ocupadas + cantidad)
+            for idioma, id_carton, palabras, claves in entradas:
+                if palabras and self._registrar(idioma, id_carton, palabras, claves) is not None:
+                    nuevos += 1
+        return nuevos
+
+    def agregar(self, cartones: Iterable[Carton]) -> int:
+        return self.agregar_claves((carton.idioma, carton.id, carton.palabras, None) for carton in cartones)
+
+    def resultado(self) -> Dict[str, list]:
+        with self._cerrojo:
+            duplicados = [list(ids) for grupos in self._duplicados.values() for ids in grupos.values()]
+            return {"duplicados": duplicados, "similares": list(self.similares)}
+
+
+def analizar_solapamiento(cartones: Dict[str, Dict[str, Carton]], umbral: float = UMBRAL_SIMILITUD,
+                          num_permutaciones: int = NUM_PERMUTACIONES, bandas: int = BANDAS,
+                          semilla: int = 0) -> Dict[str, list]:
+    indice = IndiceSolapamiento(umbral, num_permutaciones, bandas, semilla)
+    for cartones_idioma in cartones.values():
+        indice.agregar(cartones_idioma.values())
+    return indice.resultado()
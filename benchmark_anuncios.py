@@ -0,0 +1,67 @@
+import os
+import time
+import argparse
+import tempfile
+from typing import List, Tuple
+from constantes import IDIOMAS
+from gestor import GestorBingo
+from repositorio import RepositorioPalabras
+from generador import generar_cartones
+
+
+def _preparar(repositorio: RepositorioPalabras, ruta: str, idioma: str, semilla: int) -> Tuple[GestorBingo, List[str]]:
+    gestor = GestorBingo(repositorio)
+    gestor.cargar_desde_archivo(ruta, analizar=False)
+    gestor.iniciar_partida(semilla)
+    while gestor.obtener_idioma_actual() != idioma:
+        gestor.avanzar_ronda()
+    limite = gestor.calcular_limite_extracciones(idioma)
+    return gestor, gestor.extraer_palabras(limite)
+
+
+def medir(repositorio: RepositorioPalabras, ruta: str, idioma: str, semilla: int) -> dict:
+    secuencial, palabras = _preparar(repositorio, ruta, idioma, semilla)
+    inicio = time.perf_counter()
+    for palabra in palabras:
+        secuencial.anunciar_palabra(palabra)
+    tiempo_secuencial = time.perf_counter() - inicio
+    lote, _ = _preparar(repositorio, ruta, idioma, semilla)
+    inicio = time.perf_counter()
+    lote.anunciar_palabras(palabras)
+    tiempo_lote = time.perf_counter() - inicio
+    if (secuencial.ganadores != lote.ganadores
+            or secuencial.extraccion_ganadores != lote.extraccion_ganadores):
+        raise AssertionError("anunciar_palabras no coincide con las llamadas secuenciales")
+    return {
+        "idioma": idioma,
+        "cartones": len(secuencial.cartones[idioma]),
+        "extracciones": len(palabras),
+        "ganadores": len(secuencial.ganadores[idioma]),
+        "secuencial_s": tiempo_secuencial,
+        "lote_s": tiempo_lote
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara anunciar_palabra secuencial con anunciar_palabras")
+    parser.add_argument("cantidad", type=int, nargs="?", default=200000)
+    parser.add_argument("--idioma", default="EN", choices=list(IDIOMAS.keys()))
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    repositorio = RepositorioPalabras()
+    descriptor, ruta = tempfile.mkstemp(suffix=".txt")
+    os.close(descriptor)
+    try:
+        generar_cartones(ruta, args.cantidad, args.semilla, [args.idioma], repositorio=repositorio)
+        resultado = medir(repositorio, ruta, args.idioma, args.semilla)
+        print(f"Cartones: {resultado['cartones']} ({resultado['idioma']}) - "
+              f"extracciones: {resultado['extracciones']} - ganadores: {resultado['ganadores']}")
+        print(f"  {'secuencial':<12} {resultado['secuencial_s']:8.2f} s")
+        print(f"  {'lote':<12} {resultado['lote_s']:8.2f} s")
+        print(f"  {'aceleración':<12} {resultado['secuencial_s'] / resultado['lote_s']:8.2f}x")
+    finally:
+        os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import time
+import argparse
+import tempfile
+from typing import Dict
+from gestor import GestorBingo
+from repositorio import RepositorioPalabras
+from generador import generar_cartones
+from distribuido import GestorBingoDistribuido
+
+
+def medir(gestor, ruta: str, semilla: int) -> Dict[str, float]:
+    inicio = time.perf_counter()
+    cargados, _, _ = gestor.cargar_desde_archivo(ruta, analizar=False)
+    carga = time.perf_counter() - inicio
+    gestor.iniciar_partida(semilla)
+    distribuido = isinstance(gestor, GestorBingoDistribuido)
+    cpu_trabajadores = gestor.tiempos_cpu() if distribuido else []
+    extracciones = 0
+    inicio = time.perf_counter()
+    inicio_cpu = time.process_time()
+    while gestor.obtener_idioma_actual() is not None:
+        while not gestor.limite_alcanzado():
+            palabra = gestor.extraer_palabra()
+            if palabra is None:
+                break
+            gestor.anunciar_palabra(palabra)
+            extracciones += 1
+        gestor.avanzar_ronda()
+    juego = time.perf_counter() - inicio
+    cpu_coordinador = time.process_time() - inicio_cpu
+    if distribuido:
+        cpu_trabajadores = [fin - inicio for inicio, fin in zip(cpu_trabajadores, gestor.tiempos_cpu())]
+        critico = cpu_coordinador + max(cpu_trabajadores)
+    else:
+        critico = juego
+    return {
+        "cartones": cargados,
+        "carga_s": carga,
+        "extracciones_s": extracciones / juego,
+        "cartones_extracciones_s": cargados * extracciones / juego,
+        "estimadas_s": extracciones / critico
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalabilidad de GestorBingoDistribuido")
+    parser.add_argument("cantidad", type=int, nargs="?", default=200000)
+    parser.add_argument("--fragmentos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    repositorio = RepositorioPalabras()
+    descriptor, ruta = tempfile.mkstemp(suffix=".txt")
+    os.close(descriptor)
+    cpus = os.cpu_count() or 1
+    try:
+        generar_cartones(ruta, args.cantidad, args.semilla, repositorio=repositorio)
+        print(f"Cartones: {args.cantidad} - CPUs: {cpus}")
+        if max(args.fragmentos) > cpus:
+            print(f"Advertencia: hay más fragmentos que CPUs ({cpus}); los trabajadores comparten núcleo y "
+                  "la aceleración medida no refleja la escalabilidad. La columna 'estimada' usa el tiempo de CPU "
+                  "del coordinador más el del trabajador más cargado, como si cada proceso tuviera su propio núcleo.")
+        print(f"{'fragmentos':>10} {'carga (s)':>10} {'extr/s':>10} {'cart*extr/s':>14} {'aceleración':>12} {'estimada':>10}")
+        base = medir(GestorBingo(repositorio), ruta, args.semilla)
+        print(f"{'local':>10} {base['carga_s']:10.2f} {base['extracciones_s']:10.1f} "
+              f"{base['cartones_extracciones_s']:14.3e} {1.0:12.2f} {1.0:10.2f}")
+        for fragmentos in args.fragmentos:
+            with GestorBingoDistribuido(fragmentos, repositorio) as gestor:
+                resultado = medir(gestor, ruta, args.semilla)
+            aceleracion = resultado["extracciones_s"] / base["extracciones_s"]
+            estimada = resultado["estimadas_s"] / base["extracciones_s"]
+            print(f"{fragmentos:>10} {resultado['carga_s']:10.2f} {resultado['extracciones_s']:10.1f} "
+                  f"{resultado['cartones_extracciones_s']:14.3e} {aceleracion:12.2f} {estimada:10.2f}")
+    finally:
+        os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,15 @@ from algoritmos import (
     busqueda_binaria,
     distancia_edicion
 )
+from vocabulario import Vocabulario
 from carton import Carton
 from repositorio import RepositorioPalabras
 from gestor import GestorBingo
+from distribuido import GestorBingoDistribuido
+from analisis import IndiceSolapamiento, analizar_solapamiento, jaccard
+from exportador import ExportadorPartida, exportar_partida
+from generador import generar_cartones, generar_cartones_paralelo
+from memoria import reporte_memoria
 
 __all__ = [
     'IDIOMAS',
@@ -16,7 +22,17 @@ __all__ = [
     'merge_sort',
     'busqueda_binaria',
     'distancia_edicion',
+    'Vocabulario',
     'Carton',
     'RepositorioPalabras',
-    'GestorBingo'
+    'GestorBingo',
+    'GestorBingoDistribuido',
+    'IndiceSolapamiento',
+    'analizar_solapamiento',
+    'jaccard',
+    'ExportadorPartida',
+    'exportar_partida',
+    'generar_cartones',
+    'generar_cartones_paralelo',
+    'reporte_memoria'
 ]
@@ -1,5 +1,6 @@
-from typing import Set
-from dataclasses import dataclass, field
+from bisect import bisect_left
+from typing import Dict, Set, Tuple
+from dataclasses import dataclass
 from constantes import IDIOMAS
 
 
@@ -7,10 +8,10 @@ from constantes import IDIOMAS
 class Carton:
     id: str
     idioma: str
-    palabras: Set[str]
+    palabras: Tuple[int, ...]
     jugador_id: str = "N/A"
     aciertos: int = 0
-    palabras_marcadas: Set[str] = field(default_factory=set)
+    marcadas: int = 0
 
     @property
     def max_palabras(self) -> int:
@@ -20,16 +21,38 @@ class Carton:
     def es_ganador(self) -> bool:
         return self.aciertos == len(self.palabras)
 
-    def marcar_palabra(self, palabra: str) -> bool:
-        if palabra in self.palabras and palabra not in self.palabras_marcadas:
-            self.palabras_marcadas.add(palabra)
-            self.aciertos += 1
-            return True
+    @property
+    def palabras_marcadas(self) -> Set[int]:
+        return {palabra for i, palabra in enumerate(self.palabras) if self.marcadas >> i & 1}
+
+    def marcar_palabra(self, palabra: int) -> bool:
+        posicion = bisect_left(self.palabras, palabra)
+        if posicion < len(self.palabras) and self.palabras[posicion] == palabra:
+            bit = 1 << posicion
+            if not self.marcadas & bit:
+                self.marcadas |= bit
+                self.aciertos += 1
+                return True
         return False
 
+    def marcar_palabras(self, posiciones: Dict[int, int]) -> int:
+        ultima = -1
+        marcadas = self.marcadas
+        bit = 1
+        for palabra in self.palabras:
+            posicion = posiciones.get(palabra)
+            if posicion is not None and not marcadas & bit:
+                marcadas |= bit
+                if posicion > ultima:
+                    ultima = posicion
+            bit <<= 1
+        self.aciertos += bin(marcadas ^ self.marcadas).count("1")
+        self.marcadas = marcadas
+        return ultima
+
     def reiniciar(self):
         self.aciertos = 0
-        self.palabras_marcadas.clear()
+        self.marcadas = 0
 
     def __str__(self) -> str:
         return f"[{self.id}] Jugador: {self.jugador_id} - {IDIOMAS[self.idioma]['nombre']} - {self.aciertos}/{len(self.palabras)} palabras"
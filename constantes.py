@@ -2,6 +2,13 @@ import os
 
 RUTA_REPOSITORIO = os.path.join(os.path.dirname(__file__), "repositorio")
 
+ARCHIVOS_REPOSITORIO = {
+    "SP": "palabras_SP.txt",
+    "EN": "palabras_EN.txt",
+    "PT": "palabras_PT.txt",
+    "DT": "palabras_DT.txt"
+}
+
 IDIOMAS = {
     "SP": {"nombre": "Español", "max_palabras": 24},
     "EN": {"nombre": "Inglés", "max_palabras": 14},
@@ -0,0 +1,468 @@
+import os
+import re
+import zlib
+import time
+import multiprocessing
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from constantes import IDIOMAS
+from carton import Carton
+from gestor import GestorBingo
+from analisis import IndiceSolapamiento
+from repositorio import RepositorioPalabras
+from memoria import reporte_memoria, tamano_profundo
+
+PATRON_LINEA = re.compile(r"Línea (\d+):")
+TAMANO_BLOQUE = 50000
+
+
+def fragmento_de(id_carton: str, fragmentos: int) -> int:
+    return zlib.crc32(id_carton.upper().encode()) % fragmentos
+
+
+class _Fragmento:
+    PROPIOS = {"cargar_desde_archivo", "agregar_carton", "anunciar_palabra", "anunciar_palabras", "contar_cartones",
+               "claves_pendientes", "obtener_carton", "abrir_cursor", "listar_cartones", "cerrar_cursor",
+               "palabras_indexadas", "cartones_con_palabra", "reporte_memoria", "tiempo_cpu"}
+
+    def __init__(self, indice: int, fragmentos: int, ruta_repositorio: str):
+        self.indice = indice
+        self.fragmentos = fragmentos
+        self.gestor = GestorBingo(RepositorioPalabras(ruta_repositorio))
+        self.secuencias: Dict[str, int] = {}
+        self.cursores: Dict[int, Iterator[Carton]] = {}
+        self._siguiente_cursor = 0
+
+    def _filtro_carga(self, carga: int) -> Callable[[str], bool]:
+        lineas = 0
+
+        def filtro(id_carton: str) -> bool:
+            nonlocal lineas
+            lineas += 1
+            if fragmento_de(id_carton, self.fragmentos) != self.indice:
+                return False
+            id_carton = id_carton.upper()
+            if id_carton not in self.gestor.cartones.get(id_carton[:2], {}):
+                self.secuencias[id_carton] = carga << 32 | lineas
+            return True
+        return filtro
+
+    def cargar_desde_archivo(self, carga: int, ruta_archivo: str, analizar: bool) -> Tuple[int, int, List[str]]:
+        return self.gestor.cargar_desde_archivo(ruta_archivo, analizar, filtro_ids=self._filtro_carga(carga))
+
+    def agregar_carton(self, carga: int, id_carton: str, palabras: List[str], jugador_id: str) -> Tuple[bool, str]:
+        exito, mensaje = self.gestor.agregar_carton(id_carton, palabras, jugador_id)
+        if exito:
+            self.secuencias[id_carton.upper()] = carga << 32
+        return exito, mensaje
+
+    def anunciar_palabra(self, palabra: str) -> List[Tuple[int, Carton]]:
+        return [(self.secuencias[carton.id], carton) for carton in self.gestor.anunciar_palabra(palabra)]
+
+    def anunciar_palabras(self, palabras: List[str]) -> List[Tuple[int, int, Carton]]:
+        return [(posicion, self.secuencias[carton.id], carton)
+                for posicion, carton in self.gestor.anunciar_palabras(palabras)]
+
+    def claves_pendientes(self) -> List[Tuple[int, str, str, Tuple[int, ...], Optional[List[int]]]]:
+        minhash = self.gestor.indice_solapamiento.minhash
+        vistos = set()
+        entradas = []
+        for carton in self.gestor.tomar_pendientes_solapamiento():
+            claves = None
+            if (carton.idioma, carton.palabras) not in vistos:
+                vistos.add((carton.idioma, carton.palabras))
+                claves = minhash.claves_bandas(minhash.firma(carton.palabras))
+            entradas.append((self.secuencias[carton.id], carton.idioma, carton.id, carton.palabras, claves))
+        return entradas
+
+    def contar_cartones(self) -> Dict[str, int]:
+        return {idioma: len(cartones) for idioma, cartones in self.gestor.cartones.items()}
+
+    def palabras_indexadas(self, idioma: str) -> List[Tuple[int, int]]:
+        return [(self.secuencias[ids[0]], id_palabra) for id_palabra, ids in self.gestor.indice_palabras[idioma].items()]
+
+    def cartones_con_palabra(self, idioma: str, id_palabra: int) -> List[Tuple[int, str]]:
+        return [(self.secuencias[id_carton], id_carton)
+                for id_carton in self.gestor.indice_palabras[idioma].get(id_palabra, [])]
+
+    def reporte_memoria(self) -> Dict[str, int]:
+        return reporte_memoria(self.gestor)
+
+    def tiempo_cpu(self) -> float:
+        return time.process_time()
+
+    def obtener_carton(self, idioma: str, id_carton: str) -> Optional[Carton]:
+        return self.gestor.cartones[idioma].get(id_carton)
+
+    def abrir_cursor(self, idioma: str) -> int:
+        self._siguiente_cursor += 1
+        self.cursores[self._siguiente_cursor] = iter(list(self.gestor.cartones[idioma].values()))
+        return self._siguiente_cursor
+
+    def listar_cartones(self, cursor: int, cantidad: int) -> List[Carton]:
+        bloque = list(islice(self.cursores[cursor], cantidad))
+        if len(bloque) < cantidad:
+            del self.cursores[cursor]
+        return bloque
+
+    def cerrar_cursor(self, cursor: int):
+        self.cursores.pop(cursor, None)
+
+    def ejecutar(self, metodo: str, args: tuple, kwargs: dict):
+        atributo = getattr(self, metodo) if metodo in self.PROPIOS else getattr(self.gestor, metodo)
+        return atributo(*args, **kwargs) if callable(atributo) else atributo
+
+
+def _trabajador(conexion, indice: int, fragmentos: int, ruta_repositorio: str):
+    fragmento = _Fragmento(indice, fragmentos, ruta_repositorio)
+    while True:
+        mensaje = conexion.recv()
+        if mensaje is None:
+            break
+        metodo, args, kwargs = mensaje
+        try:
+            conexion.send((True, fragmento.ejecutar(metodo, args, kwargs)))
+        except Exception as e:
+            conexion.send((False, e))
+    conexion.close()
+
+
+class VistaCartones:
+    def __init__(self, distribuido: "GestorBingoDistribuido", idioma: str):
+        self._distribuido = distribuido
+        self.idioma = idioma
+
+    def __len__(self) -> int:
+        return sum(conteo[self.idioma] for conteo in self._distribuido._difundir("contar_cartones"))
+
+    def get(self, id_carton: str, defecto: Carton = None) -> Optional[Carton]:
+        id_carton = id_carton.upper()
+        indice = fragmento_de(id_carton, self._distribuido.fragmentos)
+        carton = self._distribuido._enviar(indice, "obtener_carton", self.idioma, id_carton)
+        return defecto if carton is None else carton
+
+    def __getitem__(self, id_carton: str) -> Carton:
+        carton = self.get(id_carton)
+        if carton is None:
+            raise KeyError(id_carton)
+        return carton
+
+    def __contains__(self, id_carton: str) -> bool:
+        return self.get(id_carton) is not None
+
+    def values(self) -> Iterator[Carton]:
+        for indice in range(self._distribuido.fragmentos):
+            cursor = self._distribuido._enviar(indice, "abrir_cursor", self.idioma)
+            try:
+                while True:
+                    bloque = self._distribuido._enviar(indice, "listar_cartones", cursor, TAMANO_BLOQUE)
+                    if len(bloque) < TAMANO_BLOQUE:
+                        cursor = None
+                    yield from bloque
+                    if cursor is None:
+                        break
+            finally:
+                if cursor is not None:
+                    try:
+                        self._distribuido._enviar(indice, "cerrar_cursor", cursor)
+                    except (OSError, RuntimeError):
+                        pass
+
+    def items(self) -> Iterator[Tuple[str, Carton]]:
+        return ((carton.id, carton) for carton in self.values())
+
+    def keys(self) -> Iterator[str]:
+        return (carton.id for carton in self.values())
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+
+class VistaIndice:
+    def __init__(self, distribuido: "GestorBingoDistribuido", idioma: str):
+        self._distribuido = distribuido
+        self.idioma = idioma
+
+    def keys(self) -> List[int]:
+        primeras: Dict[int, int] = {}
+        for parcial in self._distribuido._difundir("palabras_indexadas", self.idioma):
+            for secuencia, id_palabra in parcial:
+                if secuencia < primeras.get(id_palabra, secuencia + 1):
+                    primeras[id_palabra] = secuencia
+        return sorted(primeras, key=lambda id_palabra: (primeras[id_palabra], id_palabra))
+
+    def get(self, id_palabra: int, defecto: List[str] = None) -> Optional[List[str]]:
+        parciales = self._distribuido._difundir("cartones_con_palabra", self.idioma, id_palabra)
+        ids = [id_carton for _, id_carton in sorted(entrada for parcial in parciales for entrada in parcial)]
+        return ids if ids else defecto
+
+    def __getitem__(self, id_palabra: int) -> List[str]:
+        ids = self.get(id_palabra)
+        if ids is None:
+            raise KeyError(id_palabra)
+        return ids
+
+    def __contains__(self, id_palabra: int) -> bool:
+        return self.get(id_palabra) is not None
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+    def items(self) -> Iterator[Tuple[int, List[str]]]:
+        return ((id_palabra, self[id_palabra]) for id_palabra in self.keys())
+
+    def values(self) -> Iterator[List[str]]:
+        return (ids for _, ids in self.items())
+
+
+class GestorBingoDistribuido:
+    def __init__(self, fragmentos: int = None, repositorio: RepositorioPalabras = None,
+                 semilla: Optional[int] = None):
+        self.fragmentos = max(1, fragmentos or os.cpu_count() or 1)
+        self._maestro = GestorBingo(repositorio, semilla)
+        ruta_repositorio = self._maestro.repositorio.ruta_base
+        self._conexiones = []
+        self._procesos = []
+        for indice in range(self.fragmentos):
+            local, remota = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(target=_trabajador, args=(remota, indice, self.fragmentos, ruta_repositorio),
+                                              daemon=True)
+            proceso.start()
+            remota.close()
+            self._conexiones.append(local)
+            self._procesos.append(proceso)
+        self.solapamientos: Dict[str, list] = {"duplicados": [], "similares": []}
+        self.indice_solapamiento = IndiceSolapamiento()
+        self._error: Optional[Exception] = None
+        self._cargas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def cerrar(self):
+        for conexion in self._conexiones:
+            try:
+                conexion.send(None)
+                conexion.close()
+            except OSError:
+                pass
+        for proceso in self._procesos:
+            proceso.join()
+        self._conexiones = []
+        self._procesos = []
+
+    def _verificar(self):
+        if self._error is not None:
+            raise RuntimeError(f"Los trabajadores quedaron en estados distintos tras un error: {self._error!r}")
+
+    def _difundir(self, metodo: str, *args, **kwargs) -> list:
+        self._verificar()
+        for conexion in self._conexiones:
+            conexion.send((metodo, args, kwargs))
+        respuestas = [conexion.recv() for conexion in self._conexiones]
+        errores = [resultado for exito, resultado in respuestas if not exito]
+        if errores:
+            if len(errores) < len(respuestas):
+                self._error = errores[0]
+            raise errores[0]
+        return [resultado for _, resultado in respuestas]
+
+    def _enviar(self, indice: int, metodo: str, *args, **kwargs):
+        self._verificar()
+        conexion = self._conexiones[indice]
+        conexion.send((metodo, args, kwargs))
+        exito, resultado = conexion.recv()
+        if not exito:
+            raise resultado
+        return resultado
+
+    @property
+    def repositorio(self) -> RepositorioPalabras:
+        return self._maestro.repositorio
+
+    @property
+    def cartones(self) -> Dict[str, VistaCartones]:
+        return {idioma: VistaCartones(self, idioma) for idioma in IDIOMAS}
+
+    @property
+    def indice_palabras(self) -> Dict[str, VistaIndice]:
+        return {idioma: VistaIndice(self, idioma) for idioma in IDIOMAS}
+
+    @property
+    def inicio_partida(self) -> Optional[float]:
+        return self._maestro.inicio_partida
+
+    @property
+    def tiempos_anunciadas(self) -> Dict[str, List[float]]:
+        return self._maestro.tiempos_anunciadas
+
+    @property
+    def palabras_desconocidas(self) -> Dict[str, List[str]]:
+        return self._maestro.palabras_desconocidas
+
+    @property
+    def recargas(self) -> List[Dict]:
+        return self._maestro.recargas
+
+    @property
+    def orden_rondas(self) -> List[str]:
+        return self._maestro.orden_rondas
+
+    @property
+    def ronda_actual(self) -> int:
+        return self._maestro.ronda_actual
+
+    @property
+    def semilla_partida(self) -> Optional[int]:
+        return self._maestro.semilla_partida
+
+    @property
+    def palabras_anunciadas(self) -> Dict[str, List[int]]:
+        return self._maestro.palabras_anunciadas
+
+    @property
+    def ganadores(self) -> Dict[str, List[str]]:
+        return self._maestro.ganadores
+
+    @property
+    def extraccion_ganadores(self) -> Dict[str, List[int]]:
+        return self._maestro.extraccion_ganadores
+
+    def validar_id_carton(self, id_carton: str) -> Tuple[bool, str]:
+        return self._maestro.validar_id_carton(id_carton)
+
+    def agregar_carton(self, id_carton: str, palabras: List[str], jugador_id: str = "N/A") -> Tuple[bool, str]:
+        es_valido, resultado = self.validar_id_carton(id_carton)
+        if not es_valido:
+            return False, resultado
+        indice = fragmento_de(id_carton, self.fragmentos)
+        self._cargas += 1
+        return self._enviar(indice, "agregar_carton", self._cargas, id_carton, palabras, jugador_id)
+
+    def cargar_desde_archivo(self, ruta_archivo: str, analizar: bool = True) -> Tuple[int, int, List[str]]:
+        self._cargas += 1
+        resultados = self._difundir("cargar_desde_archivo", self._cargas, ruta_archivo, False)
+        cargados = sum(r[0] for r in resultados)
+        fallidos = sum(r[1] for r in resultados)
+        errores = list(dict.fromkeys(error for r in resultados for error in r[2]))
+        errores.sort(key=lambda error: int(PATRON_LINEA.match(error).group(1)) if PATRON_LINEA.match(error) else 0)
+        if analizar and cargados > 0:
+            self.analizar_solapamientos()
+        return cargados, fallidos, errores
+
+    def analizar_solapamientos(self) -> Dict[str, list]:
+        entradas = sorted((entrada for resultado in self._difundir("claves_pendientes") for entrada in resultado),
+                          key=lambda entrada: entrada[0])
+        self.indice_solapamiento.agregar_claves(entrada[1:] for entrada in entradas)
+        self.solapamientos = self.indice_solapamiento.resultado()
+        return self.solapamientos
+
+    def recargar_repositorio(self, idioma: str = None, solo_modificados: bool = False) -> Dict[str, Tuple[List[str], List[str]]]:
+        protegidas: Dict[str, set] = {}
+        for parcial in self._difundir("palabras_protegidas"):
+            for lang, ids in parcial.items():
+                protegidas.setdefault(lang, set()).update(ids)
+        cambios = self._maestro.recargar_repositorio(idioma, solo_modificados, protegidas)
+        if cambios:
+            self._difundir("aplicar_cambios_repositorio", cambios)
+        return cambios
+
+    def iniciar_partida(self, semilla: Optional[int] = None):
+        if semilla is None:
+            semilla = self._maestro.nueva_semilla()
+        self._difundir("iniciar_partida", semilla)
+        return self._maestro.iniciar_partida(semilla)
+
+    def obtener_idioma_actual(self) -> Optional[str]:
+        return self._maestro.obtener_idioma_actual()
+
+    def extraer_palabras(self, cantidad: int) -> List[str]:
+        return self._maestro.extraer_palabras(cantidad)
+
+    def extraer_palabra(self) -> Optional[str]:
+        return self._maestro.extraer_palabra()
+
+    def decodificar_palabras(self, idioma: str, ids: List[int]) -> List[str]:
+        return self._maestro.decodificar_palabras(idioma, ids)
+
+    def obtener_palabras_carton(self, carton: Carton) -> List[str]:
+        return self._maestro.obtener_palabras_carton(carton)
+
+    def obtener_palabras_anunciadas(self, idioma: str) -> List[str]:
+        return self._maestro.obtener_palabras_anunciadas(idioma)
+
+    def anunciar_palabra(self, palabra: str) -> List[Carton]:
+        idioma = self.obtener_idioma_actual()
+        if idioma is None:
+            return []
+        resultados = self._difundir("anunciar_palabra", palabra)
+        self._maestro.anunciar_palabra(palabra)
+        extraccion = len(self._maestro.palabras_anunciadas[idioma])
+        nuevos_ganadores = [carton for _, carton in sorted((par for resultado in resultados for par in resultado),
+                                                            key=lambda par: par[0])]
+        for carton in nuevos_ganadores:
+            self._maestro.ganadores[idioma].append(carton.id)
+            self._maestro.extraccion_ganadores[idioma].append(extraccion)
+        return nuevos_ganadores
+
+    def anunciar_palabras(self, palabras: List[str]) -> List[Tuple[int, Carton]]:
+        idioma = self.obtener_idioma_actual()
+        if idioma is None:
+            return []
+        base = len(self._maestro.palabras_anunciadas[idioma])
+        resultados = self._difundir("anunciar_palabras", palabras)
+        self._maestro.anunciar_palabras(palabras)
+        nuevos_ganadores = [(posicion, carton) for posicion, _, carton in
+                            sorted((terna for resultado in resultados for terna in resultado), key=lambda terna: terna[:2])]
+        for posicion, carton in nuevos_ganadores:
+            self._maestro.ganadores[idioma].append(carton.id)
+            self._maestro.extraccion_ganadores[idioma].append(base + posicion + 1)
+        return nuevos_ganadores
+
+    def calcular_limite_extracciones(self, idioma: str) -> int:
+        return self._maestro.calcular_limite_extracciones(idioma)
+
+    def limite_alcanzado(self) -> bool:
+        return self._maestro.limite_alcanzado()
+
+    def obtener_extracciones_info(self) -> Tuple[int, int]:
+        return self._maestro.obtener_extracciones_info()
+
+    def avanzar_ronda(self) -> Tuple[bool, str]:
+        self._difundir("avanzar_ronda")
+        return self._maestro.avanzar_ronda()
+
+    def obtener_estadisticas(self) -> Dict:
+        stats = self._maestro.obtener_estadisticas()
+        conteos = self._difundir("contar_cartones")
+        stats["total_cartones"] = sum(sum(conteo.values()) for conteo in conteos)
+        for idioma in IDIOMAS:
+            stats["por_idioma"][IDIOMAS[idioma]["nombre"]]["cartones"] = sum(conteo[idioma] for conteo in conteos)
+        return stats
+
+    def reporte_memoria(self) -> Dict[str, int]:
+        vistos = set()
+        reporte = {
+            "repositorio": tamano_profundo(self._maestro.repositorio, vistos),
+            "cartones": 0,
+            "indice_palabras": 0,
+            "indice_solapamiento": tamano_profundo(self.indice_solapamiento, vistos),
+            "estado_partida": tamano_profundo([self._maestro.palabras_anunciadas, self._maestro.ganadores], vistos)
+        }
+        for parcial in self._difundir("reporte_memoria"):
+            for componente in reporte:
+                reporte[componente] += parcial[componente]
+        reporte["total"] = sum(reporte.values())
+        return reporte
+
+    def tiempos_cpu(self) -> List[float]:
+        return self._difundir("tiempo_cpu")
+
+    def obtener_estado_cartones(self, idioma: str = None) -> List[Dict]:
+        return [estado for resultado in self._difundir("obtener_estado_cartones", idioma) for estado in resultado]
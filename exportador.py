@@ -0,0 +1,159 @@
+import csv
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from constantes import IDIOMAS
+from carton import Carton
+from gestor import GestorBingo
+from vocabulario import Vocabulario
+
+TAMANO_BLOQUE = 50000
+FORMATOS = ("csv", "parquet")
+
+COLUMNAS_CARTONES = ["id", "jugador_id", "idioma", "aciertos", "total_palabras", "es_ganador", "palabras"]
+COLUMNAS_ANUNCIADAS = ["idioma", "extraccion", "palabra", "segundos"]
+COLUMNAS_GANADORES = ["idioma", "posicion", "id", "jugador_id", "extraccion"]
+COLUMNAS_RECARGAS = ["idioma", "ronda", "extraccion", "agregadas", "eliminadas"]
+
+TIPOS_CARTONES = ["string", "string", "string", "int64", "int64", "bool", "string"]
+TIPOS_ANUNCIADAS = ["string", "int64", "string", "double"]
+TIPOS_GANADORES = ["string", "int64", "string", "string", "int64"]
+TIPOS_RECARGAS = ["string", "int64", "int64", "string", "string"]
+
+
+class ExportadorPartida:
+    def __init__(self, gestor: GestorBingo, ruta_base: str, formato: str = "csv",
+                 tamano_bloque: int = TAMANO_BLOQUE):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato inválido: {formato}. Válidos: {list(FORMATOS)}")
+        self.ruta_base = ruta_base
+        self.formato = formato
+        self.tamano_bloque = tamano_bloque
+        self.rutas: List[str] = []
+        self.error: Optional[Exception] = None
+        self._hilo: Optional[threading.Thread] = None
+        self._capturar(gestor)
+
+    def _capturar(self, gestor: GestorBingo):
+        inicio = gestor.inicio_partida or 0.0
+        self._vocabularios: Dict[str, Vocabulario] = {}
+        self._desconocidas: Dict[str, List[str]] = {}
+        self._cartones: Dict[str, List[Carton]] = {}
+        self._aciertos: Dict[str, array] = {}
+        self._anunciadas: Dict[str, List[Tuple[int, float]]] = {}
+        self._ganadores: Dict[str, List[Tuple[str, str, int]]] = {}
+        self._recargas: List[dict] = list(gestor.recargas)
+        for idioma in IDIOMAS:
+            self._vocabularios[idioma] = gestor.repositorio.vocabulario[idioma]
+            self._desconocidas[idioma] = list(gestor.palabras_desconocidas[idioma])
+            cartones = list(gestor.cartones[idioma].values())
+            self._cartones[idioma] = cartones
+            self._aciertos[idioma] = array('H', (carton.aciertos for carton in cartones))
+            self._anunciadas[idioma] = [(palabra, tiempo - inicio) for palabra, tiempo in
+                                        zip(gestor.palabras_anunciadas[idioma], gestor.tiempos_anunciadas[idioma])]
+            ids_ganadores = set(gestor.ganadores[idioma])
+            jugadores = {carton.id: carton.jugador_id for carton in cartones if carton.id in ids_ganadores}
+            self._ganadores[idioma] = [(id_carton, jugadores[id_carton], extraccion)
+                                       for id_carton, extraccion in
+                                       zip(gestor.ganadores[idioma], gestor.extraccion_ganadores[idioma])]
+
+    def _filas_cartones(self) -> Iterator[list]:
+        for idioma, cartones in self._cartones.items():
+            aciertos = self._aciertos[idioma]
+            decodificar_lista = self._vocabularios[idioma].decodificar_lista
+            for i, carton in enumerate(cartones):
+                total = len(carton.palabras)
+                yield [carton.id, carton.jugador_id, idioma, aciertos[i], total,
+                       aciertos[i] == total, " ".join(sorted(decodificar_lista(carton.palabras)))]
+
+    def _filas_anunciadas(self) -> Iterator[list]:
+        for idioma, anunciadas in self._anunciadas.items():
+            decodificar = self._vocabularios[idioma].decodificar
+            desconocidas = self._desconocidas[idioma]
+            for extraccion, (palabra, segundos) in enumerate(anunciadas, 1):
+                texto = decodificar(palabra) if palabra >= 0 else desconocidas[~palabra]
+                yield [idioma, extraccion, texto, round(segundos, 6)]
+
+    def _filas_ganadores(self) -> Iterator[list]:
+        for idioma, ganadores in self._ganadores.items():
+            for posicion, (id_carton, jugador_id, extraccion) in enumerate(ganadores, 1):
+                yield [idioma, posicion, id_carton, jugador_id, extraccion]
+
+    def _filas_recargas(self) -> Iterator[list]:
+        for recarga in self._recargas:
+            yield [recarga["idioma"], recarga["ronda"] + 1, recarga["extraccion"],
+                   " ".join(recarga["agregadas"]), " ".join(recarga["eliminadas"])]
+
+    def _bloques(self, filas: Iterator[list]) -> Iterator[List[list]]:
+        bloque = []
+        for fila in filas:
+            bloque.append(fila)
+            if len(bloque) >= self.tamano_bloque:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
+
+    def _escribir_csv(self, ruta: str, columnas: List[str], tipos: List[str], filas: Iterator[list]):
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(columnas)
+            for bloque in self._bloques(filas):
+                escritor.writerows(bloque)
+
+    def _escribir_parquet(self, ruta: str, columnas: List[str], tipos: List[str], filas: Iterator[list]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("El formato parquet requiere el paquete 'pyarrow' (pip install pyarrow)")
+        esquema = pa.schema([(columna, pa.type_for_alias(tipo)) for columna, tipo in zip(columnas, tipos)])
+        with pq.ParquetWriter(ruta, esquema) as escritor:
+            for bloque in self._bloques(filas):
+                valores = dict(zip(columnas, map(list, zip(*bloque))))
+                escritor.write_table(pa.Table.from_pydict(valores, schema=esquema))
+
+    def exportar(self) -> List[str]:
+        tablas = [
+            ("cartones", COLUMNAS_CARTONES, TIPOS_CARTONES, self._filas_cartones()),
+            ("anunciadas", COLUMNAS_ANUNCIADAS, TIPOS_ANUNCIADAS, self._filas_anunciadas()),
+            ("ganadores", COLUMNAS_GANADORES, TIPOS_GANADORES, self._filas_ganadores()),
+            ("recargas", COLUMNAS_RECARGAS, TIPOS_RECARGAS, self._filas_recargas())
+        ]
+        escribir = self._escribir_csv if self.formato == "csv" else self._escribir_parquet
+        self.rutas = []
+        for nombre, columnas, tipos, filas in tablas:
+            ruta = f"{self.ruta_base}_{nombre}.{self.formato}"
+            escribir(ruta, columnas, tipos, filas)
+            self.rutas.append(ruta)
+        return self.rutas
+
+    def _exportar_capturando_error(self):
+        try:
+            self.exportar()
+        except Exception as e:
+            self.error = e
+
+    def exportar_en_segundo_plano(self) -> threading.Thread:
+        self._hilo = threading.Thread(target=self._exportar_capturando_error, name="ExportadorPartida")
+        self._hilo.start()
+        return self._hilo
+
+    @property
+    def terminado(self) -> bool:
+        return self._hilo is None or not self._hilo.is_alive()
+
+    def esperar(self, timeout: float = None) -> bool:
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+        return self.terminado
+
+
+def exportar_partida(gestor: GestorBingo, ruta_base: str, formato: str = "csv",
+                     en_segundo_plano: bool = True) -> ExportadorPartida:
+    exportador = ExportadorPartida(gestor, ruta_base, formato)
+    if en_segundo_plano:
+        exportador.exportar_en_segundo_plano()
+    else:
+        exportador.exportar()
+    return exportador
@@ -0,0 +1,128 @@
+import os
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set
+from constantes import IDIOMAS
+from repositorio import RepositorioPalabras
+
+MAX_CARTONES_POR_IDIOMA = 999999
+TAMANO_BLOQUE = 10000
+TAMANO_BUFFER = 1 << 20
+LETRAS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _mutar(palabra: str, rng: random.Random) -> str:
+    if len(palabra) < 2:
+        return palabra + rng.choice(LETRAS)
+    i = rng.randrange(len(palabra))
+    operacion = rng.randrange(3)
+    if operacion == 0:
+        return palabra[:i] + palabra[i + 1:]
+    if operacion == 1 and i < len(palabra) - 1:
+        return palabra[:i] + palabra[i + 1] + palabra[i] + palabra[i + 2:]
+    return palabra[:i] + rng.choice(LETRAS) + palabra[i + 1:]
+
+
+def _introducir_error(palabra: str, rng: random.Random, validas: Set[str]) -> str:
+    erronea = palabra
+    while erronea == palabra or erronea in validas:
+        erronea = _mutar(palabra, rng)
+    return erronea
+
+
+def _generar_bloque(bloque: int, inicio: int, fin: int, palabras: Dict[str, List[str]], idiomas: List[str],
+                    semilla: int, tasa_errores: float, jugadores: int) -> List[str]:
+    rng = random.Random(f"{semilla}:{bloque}")
+    validas = {idioma: set(palabras[idioma]) for idioma in idiomas} if tasa_errores else {}
+    lineas = []
+    for n in range(inicio, fin):
+        idioma = idiomas[n % len(idiomas)]
+        numero = n // len(idiomas) + 1
+        disponibles = palabras[idioma]
+        seleccion = rng.sample(disponibles, min(IDIOMAS[idioma]["max_palabras"], len(disponibles)))
+        if tasa_errores and rng.random() < tasa_errores:
+            i = rng.randrange(len(seleccion))
+            seleccion[i] = _introducir_error(seleccion[i], rng, validas[idioma])
+        jugador = f"J{rng.randrange(jugadores) + 1:03d}"
+        lineas.append(f"{idioma}{numero:06d} {jugador} {' '.join(seleccion)}\n")
+    return lineas
+
+
+def _escribir_fragmento(ruta: str, inicio: int, fin: int, palabras: Dict[str, List[str]], idiomas: List[str],
+                        semilla: int, tasa_errores: float, jugadores: int) -> int:
+    with open(ruta, 'w', encoding='utf-8', buffering=TAMANO_BUFFER) as archivo:
+        for bloque in range(inicio // TAMANO_BLOQUE, (fin + TAMANO_BLOQUE - 1) // TAMANO_BLOQUE):
+            bloque_inicio = bloque * TAMANO_BLOQUE
+            bloque_fin = min(fin, bloque_inicio + TAMANO_BLOQUE)
+            lineas = _generar_bloque(bloque, bloque_inicio, bloque_fin, palabras, idiomas,
+                                     semilla, tasa_errores, jugadores)
+            archivo.write("".join(lineas[max(0, inicio - bloque_inicio):]))
+    return fin - inicio
+
+
+def _preparar(cantidad: int, idiomas: List[str],
+              repositorio: Optional[RepositorioPalabras]) -> Dict[str, List[str]]:
+    for idioma in idiomas:
+        if idioma not in IDIOMAS:
+            raise ValueError(f"Idioma inválido: {idioma}. Válidos: {list(IDIOMAS.keys())}")
+    maximo = MAX_CARTONES_POR_IDIOMA * len(idiomas)
+    if cantidad > maximo:
+        raise ValueError(f"No se pueden generar más de {maximo} cartones con IDs únicos para {idiomas}")
+    repositorio = repositorio or RepositorioPalabras()
+    palabras = {idioma: list(repositorio.palabras[idioma]) for idioma in idiomas}
+    for idioma, lista in palabras.items():
+        if not lista:
+            raise ValueError(f"El repositorio de {IDIOMAS[idioma]['nombre']} está vacío")
+    return palabras
+
+
+def generar_cartones(ruta: str, cantidad: int, semilla: int = 0, idiomas: List[str] = None,
+                     tasa_errores: float = 0.0, jugadores: int = 999,
+                     repositorio: RepositorioPalabras = None) -> int:
+    idiomas = idiomas or list(IDIOMAS.keys())
+    palabras = _preparar(cantidad, idiomas, repositorio)
+    return _escribir_fragmento(ruta, 0, cantidad, palabras, idiomas, semilla, tasa_errores, jugadores)
+
+
+def generar_cartones_paralelo(ruta: str, cantidad: int, fragmentos: int = None, semilla: int = 0,
+                              idiomas: List[str] = None, tasa_errores: float = 0.0, jugadores: int = 999,
+                              repositorio: RepositorioPalabras = None) -> List[str]:
+    idiomas = idiomas or list(IDIOMAS.keys())
+    palabras = _preparar(cantidad, idiomas, repositorio)
+    fragmentos = max(1, fragmentos or os.cpu_count() or 1)
+    limites = [cantidad * i // fragmentos for i in range(fragmentos + 1)]
+    raiz, extension = os.path.splitext(ruta)
+    rutas = []
+    with ProcessPoolExecutor(max_workers=fragmentos) as ejecutor:
+        futuros = []
+        for i in range(fragmentos):
+            ruta_fragmento = f"{raiz}_{i:03d}{extension}"
+            rutas.append(ruta_fragmento)
+            futuros.append(ejecutor.submit(_escribir_fragmento, ruta_fragmento, limites[i], limites[i + 1], palabras,
+                                           idiomas, semilla, tasa_errores, jugadores))
+        for futuro in futuros:
+            futuro.result()
+    return rutas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera archivos de cartones para pruebas de carga")
+    parser.add_argument("ruta")
+    parser.add_argument("cantidad", type=int)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--idiomas", nargs="+", choices=list(IDIOMAS.keys()))
+    parser.add_argument("--errores", type=float, default=0.0)
+    parser.add_argument("--fragmentos", type=int, default=1)
+    args = parser.parse_args()
+    if args.fragmentos > 1:
+        rutas = generar_cartones_paralelo(args.ruta, args.cantidad, args.fragmentos, args.semilla,
+                                          args.idiomas, args.errores)
+        print(f"{args.cantidad} cartones escritos en {len(rutas)} fragmentos")
+    else:
+        generar_cartones(args.ruta, args.cantidad, args.semilla, args.idiomas, args.errores)
+        print(f"{args.cantidad} cartones escritos en {args.ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,39 @@
+import sys
 import random
-from typing import Dict, List, Set, Optional, Tuple
+import time
+import threading
+from collections import deque
+from itertools import chain
+from typing import Callable, Dict, List, Set, Optional, Tuple
 from constantes import IDIOMAS
 from carton import Carton
 from repositorio import RepositorioPalabras
+from analisis import IndiceSolapamiento, UMBRAL_SIMILITUD
 
 
 class GestorBingo:
-    def __init__(self, repositorio: RepositorioPalabras = None):
+    def __init__(self, repositorio: RepositorioPalabras = None, semilla: Optional[int] = None):
         self._repositorio = repositorio
+        self._rng = random.Random(semilla)
+        self.semilla_partida: Optional[int] = None
         self.cartones: Dict[str, Dict[str, Carton]] = {idioma: {} for idioma in IDIOMAS}
-        self.indice_palabras: Dict[str, Dict[str, List[str]]] = {idioma: {} for idioma in IDIOMAS}
+        self.indice_palabras: Dict[str, Dict[int, List[str]]] = {idioma: {} for idioma in IDIOMAS}
         self.orden_rondas: List[str] = list(IDIOMAS.keys())
         self.ronda_actual: int = 0
-        self.palabras_anunciadas: Dict[str, List[str]] = {idioma: [] for idioma in IDIOMAS}
+        self.palabras_anunciadas: Dict[str, List[int]] = {idioma: [] for idioma in IDIOMAS}
+        self.palabras_desconocidas: Dict[str, List[str]] = {idioma: [] for idioma in IDIOMAS}
+        self._ids_desconocidas: Dict[str, Dict[str, int]] = {idioma: {} for idioma in IDIOMAS}
         self.ganadores: Dict[str, List[str]] = {idioma: [] for idioma in IDIOMAS}
+        self.extraccion_ganadores: Dict[str, List[int]] = {idioma: [] for idioma in IDIOMAS}
+        self.tiempos_anunciadas: Dict[str, List[float]] = {idioma: [] for idioma in IDIOMAS}
+        self.inicio_partida: Optional[float] = None
+        self.permutaciones: Dict[str, List[int]] = {idioma: [] for idioma in IDIOMAS}
+        self.posicion_extraccion: Dict[str, int] = {idioma: 0 for idioma in IDIOMAS}
+        self.solapamientos: Dict[str, list] = {"duplicados": [], "similares": []}
+        self.indice_solapamiento = IndiceSolapamiento()
+        self._pendientes_solapamiento: deque = deque()
+        self._cerrojo_solapamiento = threading.Lock()
+        self.recargas: List[Dict] = []
 
     @property
     def repositorio(self) -> RepositorioPalabras:
@@ -21,6 +41,30 @@ class GestorBingo:
             self._repositorio = RepositorioPalabras()
         return self._repositorio
 
+    def decodificar_palabras(self, idioma: str, ids: List[int]) -> List[str]:
+        palabras = self.repositorio.vocabulario[idioma].palabras
+        desconocidas = self.palabras_desconocidas[idioma]
+        return [palabras[id_palabra] if id_palabra >= 0 else desconocidas[~id_palabra] for id_palabra in ids]
+
+    def codificar_anunciada(self, idioma: str, palabra: str) -> int:
+        palabra = palabra.strip().lower()
+        id_palabra = self.repositorio.vocabulario[idioma].obtener_id(palabra)
+        if id_palabra is not None:
+            return id_palabra
+        ids_desconocidas = self._ids_desconocidas[idioma]
+        id_palabra = ids_desconocidas.get(palabra)
+        if id_palabra is None:
+            id_palabra = ~len(self.palabras_desconocidas[idioma])
+            self.palabras_desconocidas[idioma].append(palabra)
+            ids_desconocidas[palabra] = id_palabra
+        return id_palabra
+
+    def obtener_palabras_carton(self, carton: Carton) -> List[str]:
+        return self.decodificar_palabras(carton.idioma, carton.palabras)
+
+    def obtener_palabras_anunciadas(self, idioma: str) -> List[str]:
+        return self.decodificar_palabras(idioma, self.palabras_anunciadas[idioma])
+
     def validar_palabras_en_repositorio(self, idioma: str, palabras: Set[str]) -> Tuple[bool, List[str]]:
         palabras_invalidas = []
         for palabra in palabras:
@@ -75,12 +119,15 @@ class GestorBingo:
             if len(palabras_invalidas) > 5:
                 mensaje += f"\n  ... (+{len(palabras_invalidas)-5} más)"
             return False, mensaje
-        carton = Carton(id=id_carton, idioma=idioma, palabras=palabras_normalizadas, jugador_id=jugador_id)
+        vocabulario = self.repositorio.vocabulario[idioma]
+        ids_palabras = tuple(sorted(vocabulario.obtener_id(p) for p in palabras_normalizadas))
+        carton = Carton(id=id_carton, idioma=idioma, palabras=ids_palabras, jugador_id=sys.intern(jugador_id))
         self.cartones[idioma][id_carton] = carton
-        for palabra in palabras_normalizadas:
-            if palabra not in self.indice_palabras[idioma]:
-                self.indice_palabras[idioma][palabra] = []
-            self.indice_palabras[idioma][palabra].append(id_carton)
+        self._pendientes_solapamiento.append(carton)
+        for id_palabra in ids_palabras:
+            if id_palabra not in self.indice_palabras[idioma]:
+                self.indice_palabras[idioma][id_palabra] = []
+            self.indice_palabras[idioma][id_palabra].append(id_carton)
         return True, f"Cartón {id_carton} agregado correctamente"
 
     def _es_jugador_id(self, texto: str) -> bool:
@@ -88,7 +135,22 @@ class GestorBingo:
             return False
         return texto[0].isalpha() and texto[1:].isdigit()
 
-    def cargar_desde_archivo(self, ruta_archivo: str) -> Tuple[int, int, List[str]]:
+    def tomar_pendientes_solapamiento(self) -> List[Carton]:
+        pendientes = self._pendientes_solapamiento
+        return [pendientes.popleft() for _ in range(len(pendientes))]
+
+    def analizar_solapamientos(self, umbral: float = UMBRAL_SIMILITUD) -> Dict[str, list]:
+        with self._cerrojo_solapamiento:
+            if umbral != self.indice_solapamiento.umbral:
+                self.tomar_pendientes_solapamiento()
+                self.indice_solapamiento = IndiceSolapamiento(umbral)
+                self.indice_solapamiento.agregar([c for cartones in self.cartones.values() for c in cartones.values()])
+            self.indice_solapamiento.agregar(self.tomar_pendientes_solapamiento())
+            self.solapamientos = self.indice_solapamiento.resultado()
+        return self.solapamientos
+
+    def cargar_desde_archivo(self, ruta_archivo: str, analizar: bool = True,
+                             filtro_ids: Callable[[str], bool] = None) -> Tuple[int, int, List[str]]:
         cargados = 0
         fallidos = 0
         errores = []
@@ -99,6 +161,8 @@ class GestorBingo:
                     if not linea:
                         continue
                     partes = linea.split()
+                    if filtro_ids is not None and not filtro_ids(partes[0]):
+                        continue
                     if len(partes) < 2:
                         errores.append(f"Línea {num_linea}: Formato inválido (se requiere ID y al menos 1 palabra)")
                         fallidos += 1
@@ -124,16 +188,87 @@ class GestorBingo:
             errores.append(f"Archivo no encontrado: {ruta_archivo}")
         except Exception as e:
             errores.append(f"Error al leer archivo: {str(e)}")
+        if analizar and cargados > 0:
+            self.analizar_solapamientos()
         return cargados, fallidos, errores
 
-    def iniciar_partida(self):
-        random.shuffle(self.orden_rondas)
+    def derivar_generador(self, *etiquetas: str) -> random.Random:
+        return random.Random(":".join([str(self.semilla_partida), *etiquetas]))
+
+    def generar_permutacion(self, idioma: str) -> List[int]:
+        ids = self.repositorio.vocabulario[idioma].ids
+        permutacion = [ids[palabra] for palabra in self.repositorio.palabras[idioma]]
+        self.derivar_generador("extracciones", idioma).shuffle(permutacion)
+        return permutacion
+
+    def palabras_protegidas(self) -> Dict[str, Set[int]]:
+        return {idioma: set(indice) for idioma, indice in self.indice_palabras.items() if indice}
+
+    def recargar_repositorio(self, idioma: str = None, solo_modificados: bool = False,
+                             protegidas: Dict[str, Set[int]] = None) -> Dict[str, Tuple[List[str], List[str]]]:
+        if protegidas is None:
+            protegidas = self.palabras_protegidas()
+        if solo_modificados:
+            cambios = self.repositorio.recargar_modificados(protegidas)
+        else:
+            cambios = self.repositorio.recargar(idioma, protegidas)
+        self._ajustar_a_cambios(cambios)
+        return cambios
+
+    def aplicar_cambios_repositorio(self, cambios: Dict[str, Tuple[List[str], List[str]]]):
+        for idioma, (agregadas, eliminadas) in cambios.items():
+            self.repositorio.aplicar_cambios(idioma, agregadas, eliminadas)
+        self._ajustar_a_cambios(cambios)
+
+    def _ajustar_a_cambios(self, cambios: Dict[str, Tuple[List[str], List[str]]]):
+        vocabulario = self.repositorio.vocabulario
+        for lang, (agregadas, eliminadas) in cambios.items():
+            permutacion = self.permutaciones[lang]
+            if not permutacion:
+                continue
+            posicion = self.posicion_extraccion[lang]
+            self.recargas.append({
+                "idioma": lang,
+                "ronda": self.ronda_actual,
+                "extraccion": len(self.palabras_anunciadas[lang]),
+                "posicion": posicion,
+                "agregadas": agregadas,
+                "eliminadas": eliminadas
+            })
+            ids_eliminados = {vocabulario[lang].obtener_id(palabra) for palabra in eliminadas}
+            cola = [id_palabra for id_palabra in permutacion[posicion:] if id_palabra not in ids_eliminados]
+            extraidas = set(permutacion[:posicion])
+            rng = self.derivar_generador("recarga", lang, str(posicion))
+            for palabra in agregadas:
+                id_palabra = vocabulario[lang].obtener_id(palabra)
+                if id_palabra in extraidas:
+                    continue
+                cola.insert(rng.randrange(len(cola) + 1), id_palabra)
+            permutacion[posicion:] = cola
+
+    def nueva_semilla(self) -> int:
+        return self._rng.getrandbits(64)
+
+    def iniciar_partida(self, semilla: Optional[int] = None):
+        if semilla is None:
+            semilla = self.nueva_semilla()
+        self.semilla_partida = semilla
+        self.orden_rondas = list(IDIOMAS.keys())
+        self.derivar_generador("orden").shuffle(self.orden_rondas)
         self.ronda_actual = 0
+        self.inicio_partida = time.time()
+        self.recargas = []
         for idioma in IDIOMAS:
             for carton in self.cartones[idioma].values():
                 carton.reiniciar()
             self.palabras_anunciadas[idioma].clear()
+            self.palabras_desconocidas[idioma].clear()
+            self._ids_desconocidas[idioma].clear()
             self.ganadores[idioma].clear()
+            self.extraccion_ganadores[idioma].clear()
+            self.tiempos_anunciadas[idioma].clear()
+            self.permutaciones[idioma] = self.generar_permutacion(idioma)
+            self.posicion_extraccion[idioma] = 0
         return self.orden_rondas.copy()
 
     def obtener_idioma_actual(self) -> Optional[str]:
@@ -141,12 +276,27 @@ class GestorBingo:
             return self.orden_rondas[self.ronda_actual]
         return None
 
+    def extraer_palabras(self, cantidad: int) -> List[str]:
+        idioma = self.obtener_idioma_actual()
+        if idioma is None:
+            return []
+        posicion = self.posicion_extraccion[idioma]
+        ids = self.permutaciones[idioma][posicion:posicion + cantidad]
+        self.posicion_extraccion[idioma] = posicion + len(ids)
+        return self.decodificar_palabras(idioma, ids)
+
+    def extraer_palabra(self) -> Optional[str]:
+        palabras = self.extraer_palabras(1)
+        return palabras[0] if palabras else None
+
     def anunciar_palabra(self, palabra: str) -> List[Carton]:
         idioma = self.obtener_idioma_actual()
         if idioma is None:
             return []
-        palabra = palabra.strip().lower()
+        palabra = self.codificar_anunciada(idioma, palabra)
         self.palabras_anunciadas[idioma].append(palabra)
+        self.tiempos_anunciadas[idioma].append(time.time())
+        extraccion = len(self.palabras_anunciadas[idioma])
         nuevos_ganadores = []
         if palabra in self.indice_palabras[idioma]:
             ids_cartones = self.indice_palabras[idioma][palabra]
@@ -157,6 +307,42 @@ class GestorBingo:
                         if carton.es_ganador:
                             nuevos_ganadores.append(carton)
                             self.ganadores[idioma].append(id_carton)
+                            self.extraccion_ganadores[idioma].append(extraccion)
+        return nuevos_ganadores
+
+    def anunciar_palabras(self, palabras: List[str]) -> List[Tuple[int, Carton]]:
+        idioma = self.obtener_idioma_actual()
+        if idioma is None:
+            return []
+        normalizadas = [self.codificar_anunciada(idioma, palabra) for palabra in palabras]
+        base = len(self.palabras_anunciadas[idioma])
+        self.palabras_anunciadas[idioma].extend(normalizadas)
+        self.tiempos_anunciadas[idioma].extend([time.time()] * len(normalizadas))
+        indice = self.indice_palabras[idioma]
+        cartones = self.cartones[idioma]
+        posiciones: Dict[int, int] = {}
+        for posicion, palabra in enumerate(normalizadas):
+            if palabra not in posiciones and palabra in indice:
+                posiciones[palabra] = posicion
+        afectados = dict.fromkeys(chain.from_iterable(indice[palabra] for palabra in posiciones))
+        completados: Dict[int, List[Carton]] = {}
+        for id_carton in afectados:
+            carton = cartones[id_carton]
+            if carton.es_ganador:
+                continue
+            posicion = carton.marcar_palabras(posiciones)
+            if posicion >= 0 and carton.es_ganador:
+                completados.setdefault(posicion, []).append(carton)
+        nuevos_ganadores = []
+        for posicion in sorted(completados):
+            grupo = completados[posicion]
+            if len(grupo) > 1:
+                orden = {id_carton: i for i, id_carton in enumerate(indice[normalizadas[posicion]])}
+                grupo.sort(key=lambda carton: orden[carton.id])
+            for carton in grupo:
+                nuevos_ganadores.append((posicion, carton))
+                self.ganadores[idioma].append(carton.id)
+                self.extraccion_ganadores[idioma].append(base + posicion + 1)
         return nuevos_ganadores
 
     def calcular_limite_extracciones(self, idioma: str) -> int:
@@ -194,7 +380,8 @@ class GestorBingo:
             "total_cartones": sum(len(c) for c in self.cartones.values()),
             "por_idioma": {},
             "orden_rondas": [IDIOMAS[i]["nombre"] for i in self.orden_rondas],
-            "ronda_actual": self.ronda_actual + 1 if self.ronda_actual < len(self.orden_rondas) else "Finalizado"
+            "ronda_actual": self.ronda_actual + 1 if self.ronda_actual < len(self.orden_rondas) else "Finalizado",
+            "semilla_partida": self.semilla_partida
         }
         for idioma, cartones in self.cartones.items():
             stats["por_idioma"][IDIOMAS[idioma]["nombre"]] = {
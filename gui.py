@@ -1,6 +1,15 @@
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from bingo_p import GestorBingo, RepositorioPalabras, IDIOMAS, distancia_edicion
+from bingo_p import GestorBingo, RepositorioPalabras, IDIOMAS, distancia_edicion, exportar_partida
+
+INTERVALO_REFRESCO_MS = 16
+INTERVALO_TABLA_MS = 250
+INTERVALO_AUTOJUEGO_MS = 10
+EXTRACCIONES_POR_PASO = 5
+INTERVALO_VIGILANCIA_MS = 2000
+INTERVALO_ANALISIS_MS = 200
 
 
 class BingoApp:
@@ -9,13 +18,22 @@ class BingoApp:
         self.root.title("Bingo_P - Bingo con Palabras")
         self.root.geometry("900x700")
         self.root.minsize(800, 600)
-        self.gestor = GestorBingo()
         self.repositorio = RepositorioPalabras()
+        self.gestor = GestorBingo(self.repositorio)
         self.partida_activa = False
+        self.autojuego_activo = False
+        self._autojuego_programado = None
+        self._vistas_pendientes = set()
+        self._refresco_programado = None
+        self._tabla_programada = None
+        self._filas_estado = {}
+        self._idioma_estado = None
+        self._palabras_pendientes = []
         self.configurar_estilo()
         self.crear_menu()
         self.crear_interfaz()
         self.actualizar_estadisticas()
+        self.root.after(INTERVALO_VIGILANCIA_MS, self.vigilar_repositorio)
 
     def configurar_estilo(self):
         style = ttk.Style()
@@ -33,6 +51,7 @@ class BingoApp:
         menubar.add_cascade(label="Archivo", menu=menu_archivo)
         menu_archivo.add_command(label="Cargar cartones...", command=self.cargar_archivo)
         menu_archivo.add_command(label="Nuevo juego", command=self.reiniciar_todo)
+        menu_archivo.add_command(label="Exportar resultados...", command=self.exportar_resultados)
         menu_archivo.add_separator()
         menu_archivo.add_command(label="Salir", command=self.root.quit)
         menu_ayuda = tk.Menu(menubar, tearoff=0)
@@ -118,6 +137,9 @@ class BingoApp:
                                        command=self.extraer_palabra, state=tk.DISABLED,
                                        style='Accent.TButton')
         self.btn_extraer.pack(side=tk.LEFT, padx=5)
+        self.btn_autojuego = ttk.Button(frame_anunciar, text="▶ Autojugar",
+                                         command=self.alternar_autojuego, state=tk.DISABLED)
+        self.btn_autojuego.pack(side=tk.LEFT, padx=5)
         self.lbl_restantes = ttk.Label(frame_anunciar, text="", style='Status.TLabel')
         self.lbl_restantes.pack(side=tk.LEFT, padx=10)
         self.lbl_orden = ttk.Label(frame_anunciar, text="", style='Status.TLabel')
@@ -188,7 +210,7 @@ class BingoApp:
             filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
         )
         if archivo:
-            cargados, fallidos, errores = self.gestor.cargar_desde_archivo(archivo)
+            cargados, fallidos, errores = self.gestor.cargar_desde_archivo(archivo, analizar=False)
             mensaje = f"Cartones cargados: {cargados}\nCartones con error: {fallidos}"
             if errores:
                 mensaje += f"\n\nErrores:\n" + "\n".join(errores[:5])
@@ -197,10 +219,31 @@ class BingoApp:
             if cargados > 0:
                 messagebox.showinfo("Carga completada", mensaje)
                 self.lbl_archivo.config(text=f"Archivo: {archivo.split('/')[-1]}")
+                self.analizar_solapamientos()
             else:
                 messagebox.showwarning("Carga fallida", mensaje)
-            self.actualizar_lista_cartones()
-            self.actualizar_estadisticas()
+            self.marcar_vistas("cartones", "estadisticas")
+
+    def analizar_solapamientos(self):
+        gestor = self.gestor
+        previos = gestor.solapamientos
+        hilo = threading.Thread(target=gestor.analizar_solapamientos, name="AnalisisSolapamiento", daemon=True)
+        hilo.start()
+        self.root.after(INTERVALO_ANALISIS_MS, self.verificar_solapamientos, hilo, gestor, previos)
+
+    def verificar_solapamientos(self, hilo, gestor, previos):
+        if hilo.is_alive():
+            self.root.after(INTERVALO_ANALISIS_MS, self.verificar_solapamientos, hilo, gestor, previos)
+            return
+        if gestor is not self.gestor:
+            return
+        duplicados = gestor.solapamientos["duplicados"]
+        similares = gestor.solapamientos["similares"]
+        if (sum(map(len, duplicados)) > sum(map(len, previos["duplicados"]))
+                or len(similares) > len(previos["similares"])):
+            messagebox.showwarning("Cartones solapados",
+                                   f"{len(duplicados)} grupo(s) de cartones idénticos y "
+                                   f"{len(similares)} par(es) con alto solapamiento (posibles empates)")
 
     def agregar_carton_manual(self):
         id_carton = self.entry_id.get().strip()
@@ -218,10 +261,110 @@ class BingoApp:
             self.entry_id.delete(0, tk.END)
             self.entry_jugador.delete(0, tk.END)
             self.entry_palabras.delete(0, tk.END)
+            self.marcar_vistas("cartones", "estadisticas")
+        else:
+            messagebox.showerror("Error", mensaje)
+
+    def exportar_resultados(self):
+        if self.gestor.inicio_partida is None:
+            messagebox.showwarning("Error", "No hay resultados de partida para exportar.")
+            return
+        ruta = filedialog.asksaveasfilename(
+            title="Exportar resultados de la partida",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Parquet", "*.parquet")]
+        )
+        if not ruta:
+            return
+        base, extension = os.path.splitext(ruta)
+        formato = "parquet" if extension.lower() == ".parquet" else "csv"
+        exportador = exportar_partida(self.gestor, base, formato)
+        self.root.after(200, self.verificar_exportacion, exportador)
+
+    def verificar_exportacion(self, exportador):
+        if not exportador.terminado:
+            self.root.after(200, self.verificar_exportacion, exportador)
+        elif exportador.error:
+            messagebox.showerror("Error", f"No se pudo exportar: {exportador.error}")
+        else:
+            messagebox.showinfo("Exportación completada", "Archivos generados:\n" + "\n".join(exportador.rutas))
+
+    def marcar_vistas(self, *vistas):
+        self._vistas_pendientes.update(vistas)
+        if "estado_ronda" in vistas and self._tabla_programada is None:
+            self._tabla_programada = self.root.after(INTERVALO_TABLA_MS, self.refrescar_tabla_estado)
+        if self._refresco_programado is None:
+            self._refresco_programado = self.root.after(INTERVALO_REFRESCO_MS, self.refrescar_vistas, False)
+
+    def refrescar_vistas(self, incluir_tabla: bool = True):
+        if self._refresco_programado is not None:
+            self.root.after_cancel(self._refresco_programado)
+            self._refresco_programado = None
+        if incluir_tabla:
+            self.refrescar_tabla_estado()
+        vistas = self._vistas_pendientes - {"estado_ronda"}
+        self._vistas_pendientes -= vistas
+        if "palabras" in vistas:
+            self.volcar_palabras_pendientes()
+        if "restantes" in vistas:
+            self.actualizar_palabras_restantes()
+        if "cartones" in vistas:
             self.actualizar_lista_cartones()
+        if "estadisticas" in vistas:
             self.actualizar_estadisticas()
+
+    def agregar_texto_palabras(self, texto: str):
+        self._palabras_pendientes.append(texto)
+        self.marcar_vistas("palabras")
+
+    def volcar_palabras_pendientes(self):
+        if self._palabras_pendientes:
+            self.txt_palabras.insert(tk.END, "".join(self._palabras_pendientes))
+            self.txt_palabras.see(tk.END)
+            self._palabras_pendientes.clear()
+
+    def limpiar_palabras(self):
+        self._palabras_pendientes.clear()
+        self.txt_palabras.delete(1.0, tk.END)
+
+    def habilitar_extraccion(self, habilitar: bool):
+        estado = tk.NORMAL if habilitar else tk.DISABLED
+        self.btn_extraer.config(state=estado)
+        self.btn_autojuego.config(state=estado)
+        if not habilitar:
+            self.detener_autojuego()
+
+    def alternar_autojuego(self):
+        if self.autojuego_activo:
+            self.detener_autojuego()
         else:
-            messagebox.showerror("Error", mensaje)
+            self.autojuego_activo = True
+            self.btn_autojuego.config(text="⏸ Pausar")
+            self._autojuego_programado = self.root.after(0, self.paso_autojuego)
+
+    def detener_autojuego(self):
+        self.autojuego_activo = False
+        if self._autojuego_programado is not None:
+            self.root.after_cancel(self._autojuego_programado)
+            self._autojuego_programado = None
+        self.btn_autojuego.config(text="▶ Autojugar")
+
+    def paso_autojuego(self):
+        self._autojuego_programado = None
+        for _ in range(EXTRACCIONES_POR_PASO):
+            if not self.autojuego_activo:
+                return
+            if not self.realizar_extraccion():
+                self.detener_autojuego()
+                return
+        self._autojuego_programado = self.root.after(INTERVALO_AUTOJUEGO_MS, self.paso_autojuego)
+
+    def vigilar_repositorio(self):
+        try:
+            if self.gestor.recargar_repositorio(solo_modificados=True):
+                self.marcar_vistas("restantes")
+        finally:
+            self.root.after(INTERVALO_VIGILANCIA_MS, self.vigilar_repositorio)
 
     def actualizar_lista_cartones(self):
         for item in self.tree_cartones.get_children():
@@ -231,7 +374,7 @@ class BingoApp:
             if filtro != "Todos" and IDIOMAS[idioma]["nombre"] != filtro:
                 continue
             for id_carton, carton in cartones.items():
-                palabras_str = ", ".join(list(carton.palabras)[:5])
+                palabras_str = ", ".join(self.gestor.obtener_palabras_carton(carton)[:5])
                 if len(carton.palabras) > 5:
                     palabras_str += f"... (+{len(carton.palabras) - 5})"
                 estado = "✓ Ganador" if carton.es_ganador else f"{carton.aciertos}/{len(carton.palabras)}"
@@ -269,62 +412,69 @@ class BingoApp:
         if total == 0:
             messagebox.showwarning("Error", "No hay cartones cargados. Cargue cartones primero.")
             return
+        self.detener_autojuego()
         orden = self.gestor.iniciar_partida()
         self.partida_activa = True
-        self.txt_palabras.delete(1.0, tk.END)
+        self.limpiar_palabras()
         self.txt_ganadores.delete(1.0, tk.END)
         orden_str = " → ".join(IDIOMAS[i]["nombre"] for i in orden)
         self.lbl_orden.config(text=f"Orden: {orden_str}")
         idioma_actual = self.gestor.obtener_idioma_actual()
         self.lbl_ronda.config(text=f"Ronda: {IDIOMAS[idioma_actual]['nombre']}")
-        self.repositorio.reiniciar_ronda()
         self.btn_avanzar.config(state=tk.NORMAL)
-        self.btn_extraer.config(state=tk.NORMAL)
-        self.actualizar_estado_ronda()
-        self.actualizar_palabras_restantes()
-        self.actualizar_lista_cartones()
-        self.actualizar_estadisticas()
+        self.habilitar_extraccion(True)
+        self.marcar_vistas("estado_ronda", "restantes", "cartones", "estadisticas")
         messagebox.showinfo("Partida Iniciada",
                            f"¡Nueva partida iniciada!\n\nOrden de rondas:\n{orden_str}\n\n"
+                           f"Semilla: {self.gestor.semilla_partida}\n\n"
                            f"Comienza la ronda de {IDIOMAS[idioma_actual]['nombre']}")
 
     def extraer_palabra(self):
+        self.realizar_extraccion()
+
+    def realizar_extraccion(self) -> bool:
         if not self.partida_activa:
-            return
+            return False
         idioma_actual = self.gestor.obtener_idioma_actual()
         if idioma_actual is None:
-            return
+            return False
         if self.gestor.ganadores.get(idioma_actual, []):
+            self.detener_autojuego()
             messagebox.showinfo("Ronda finalizada",
                                f"Ya hay un ganador en la ronda de {IDIOMAS[idioma_actual]['nombre']}.\n"
                                "Avanza a la siguiente ronda para continuar.")
-            return
+            return False
         if self.gestor.limite_alcanzado():
+            self.detener_autojuego()
             messagebox.showwarning("Límite alcanzado",
                                    f"Se alcanzó el límite de extracciones para {IDIOMAS[idioma_actual]['nombre']}.\n"
                                    "Avanza a la siguiente ronda para continuar.")
-            return
-        palabra = self.repositorio.extraer_palabra(idioma_actual)
+            return False
+        palabra = self.gestor.extraer_palabra()
         if palabra is None:
+            self.detener_autojuego()
             messagebox.showwarning("Repositorio agotado",
                                    f"No quedan más palabras en el repositorio de {IDIOMAS[idioma_actual]['nombre']}")
-            return
+            return False
         ganadores = self.gestor.anunciar_palabra(palabra)
-        self.txt_palabras.insert(tk.END, f"• {palabra}\n")
-        self.txt_palabras.see(tk.END)
+        self.agregar_texto_palabras(f"• {palabra}\n")
+        self.marcar_vistas("estado_ronda", "restantes", "estadisticas")
         if ganadores:
             for carton in ganadores:
                 self.txt_ganadores.insert(tk.END, f"🏆 {carton.id}\n")
                 self.txt_ganadores.insert(tk.END, f"   Jugador: {carton.jugador_id}\n")
                 self.txt_ganadores.insert(tk.END, f"   ({IDIOMAS[idioma_actual]['nombre']})\n\n")
             self.txt_ganadores.see(tk.END)
-            self.btn_extraer.config(state=tk.DISABLED)
+            self.habilitar_extraccion(False)
+            self.refrescar_vistas()
             messagebox.showinfo("¡GANADOR!",
                                f"¡Cartón(es) ganador(es)!\n\n" +
                                "\n".join(f"• {c.id} - Jugador: {c.jugador_id}" for c in ganadores) +
                                "\n\nLa ronda ha finalizado. Avanza a la siguiente ronda.")
-        elif self.gestor.limite_alcanzado():
-            self.btn_extraer.config(state=tk.DISABLED)
+            return False
+        if self.gestor.limite_alcanzado():
+            self.habilitar_extraccion(False)
+            self.refrescar_vistas()
             extracciones, limite = self.gestor.obtener_extracciones_info()
             self.txt_ganadores.insert(tk.END, f"❌ Sin ganador\n")
             self.txt_ganadores.insert(tk.END, f"   ({IDIOMAS[idioma_actual]['nombre']})\n\n")
@@ -333,9 +483,8 @@ class BingoApp:
                                f"Se alcanzó el límite de {limite} extracciones.\n\n"
                                f"No hubo ganador en la ronda de {IDIOMAS[idioma_actual]['nombre']}.\n\n"
                                "Avanza a la siguiente ronda para continuar.")
-        self.actualizar_estado_ronda()
-        self.actualizar_palabras_restantes()
-        self.actualizar_estadisticas()
+            return False
+        return True
 
     def actualizar_palabras_restantes(self):
         idioma_actual = self.gestor.obtener_idioma_actual()
@@ -348,6 +497,7 @@ class BingoApp:
     def avanzar_ronda(self):
         if not self.partida_activa:
             return
+        self.detener_autojuego()
         idioma_anterior = self.gestor.obtener_idioma_actual()
         ganadores_ronda = self.gestor.ganadores.get(idioma_anterior, [])
         if ganadores_ronda:
@@ -359,47 +509,63 @@ class BingoApp:
         if hay_mas:
             idioma_actual = self.gestor.obtener_idioma_actual()
             self.lbl_ronda.config(text=f"Ronda: {IDIOMAS[idioma_actual]['nombre']}")
-            self.txt_palabras.insert(tk.END, f"\n--- {IDIOMAS[idioma_actual]['nombre']} ---\n")
-            self.btn_extraer.config(state=tk.NORMAL)
-            self.actualizar_estado_ronda()
-            self.actualizar_palabras_restantes()
-            self.actualizar_estadisticas()
+            self.agregar_texto_palabras(f"\n--- {IDIOMAS[idioma_actual]['nombre']} ---\n")
+            self.habilitar_extraccion(True)
+            self.marcar_vistas("estado_ronda", "restantes", "estadisticas")
             messagebox.showinfo("Nueva Ronda", f"{resumen}\n\n{mensaje}")
         else:
             self.partida_activa = False
             self.btn_avanzar.config(state=tk.DISABLED)
-            self.btn_extraer.config(state=tk.DISABLED)
+            self.habilitar_extraccion(False)
             self.lbl_ronda.config(text="Partida Finalizada")
             self.lbl_restantes.config(text="")
-            self.actualizar_estadisticas()
+            self.marcar_vistas("estadisticas")
             messagebox.showinfo("Partida Finalizada", f"{resumen}\n\n¡Todas las rondas han terminado!")
 
+    def refrescar_tabla_estado(self):
+        if self._tabla_programada is not None:
+            self.root.after_cancel(self._tabla_programada)
+            self._tabla_programada = None
+        if "estado_ronda" in self._vistas_pendientes:
+            self._vistas_pendientes.discard("estado_ronda")
+            self.actualizar_estado_ronda()
+
     def actualizar_estado_ronda(self):
-        for item in self.tree_estado.get_children():
-            self.tree_estado.delete(item)
         idioma_actual = self.gestor.obtener_idioma_actual()
-        if idioma_actual is None:
-            return
-        cartones = self.gestor.cartones[idioma_actual]
+        cartones = self.gestor.cartones[idioma_actual] if idioma_actual else {}
+        if idioma_actual != self._idioma_estado or len(self._filas_estado) > len(cartones):
+            items = self.tree_estado.get_children()
+            if items:
+                self.tree_estado.delete(*items)
+            self._filas_estado = {}
+            self._idioma_estado = idioma_actual
+        filas = self._filas_estado
         for id_carton, carton in cartones.items():
+            if filas.get(id_carton) == carton.aciertos:
+                continue
             faltan = len(carton.palabras) - carton.aciertos
             estado = "✓ GANADOR" if carton.es_ganador else "En juego"
-            self.tree_estado.insert("", tk.END, values=(id_carton, carton.jugador_id, f"{carton.aciertos}/{len(carton.palabras)}", faltan, estado))
+            valores = (id_carton, carton.jugador_id, f"{carton.aciertos}/{len(carton.palabras)}", faltan, estado)
+            if id_carton in filas:
+                self.tree_estado.item(id_carton, values=valores)
+            else:
+                self.tree_estado.insert("", tk.END, iid=id_carton, values=valores)
+            filas[id_carton] = carton.aciertos
 
     def reiniciar_todo(self):
         if messagebox.askyesno("Confirmar", "¿Desea reiniciar todo? Se perderán todos los cartones cargados."):
-            self.gestor = GestorBingo()
+            self.gestor = GestorBingo(self.repositorio)
+            self._idioma_estado = None
             self.partida_activa = False
-            self.txt_palabras.delete(1.0, tk.END)
+            self.limpiar_palabras()
             self.txt_ganadores.delete(1.0, tk.END)
             self.lbl_archivo.config(text="Ningún archivo cargado")
             self.lbl_ronda.config(text="No hay partida activa")
             self.lbl_orden.config(text="")
             self.btn_avanzar.config(state=tk.DISABLED)
-            self.btn_extraer.config(state=tk.DISABLED)
+            self.habilitar_extraccion(False)
             self.lbl_restantes.config(text="")
-            self.actualizar_lista_cartones()
-            self.actualizar_estadisticas()
+            self.marcar_vistas("cartones", "estadisticas")
 
     def mostrar_acerca_de(self):
         messagebox.showinfo("Acerca de Bingo_P",
@@ -0,0 +1,119 @@
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+from constantes import IDIOMAS
+from gestor import GestorBingo
+from repositorio import RepositorioPalabras
+from generador import generar_cartones
+
+
+@dataclass
+class _CartonCadenas:
+    id: str
+    idioma: str
+    palabras: Set[str]
+    jugador_id: str = "N/A"
+    aciertos: int = 0
+    palabras_marcadas: Set[str] = field(default_factory=set)
+
+
+def tamano_profundo(objeto, vistos: Set[int] = None) -> int:
+    vistos = set() if vistos is None else vistos
+    total = 0
+    pendientes = [objeto]
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in vistos:
+            continue
+        vistos.add(id(actual))
+        total += sys.getsizeof(actual)
+        if isinstance(actual, dict):
+            pendientes.extend(actual.keys())
+            pendientes.extend(actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset)):
+            pendientes.extend(actual)
+        elif hasattr(actual, "__dict__"):
+            pendientes.append(vars(actual))
+    return total
+
+
+def reporte_memoria(gestor: GestorBingo) -> Dict[str, int]:
+    if not isinstance(gestor, GestorBingo):
+        return gestor.reporte_memoria()
+    vistos = set()
+    reporte = {
+        "repositorio": tamano_profundo(gestor.repositorio, vistos),
+        "cartones": tamano_profundo(gestor.cartones, vistos),
+        "indice_palabras": tamano_profundo(gestor.indice_palabras, vistos),
+        "indice_solapamiento": tamano_profundo(gestor.indice_solapamiento, vistos),
+        "estado_partida": tamano_profundo([gestor.palabras_anunciadas, gestor.ganadores], vistos)
+    }
+    reporte["total"] = sum(reporte.values())
+    return reporte
+
+
+def _cargar_cadenas(ruta_archivo: str) -> List[dict]:
+    cartones = {idioma: {} for idioma in IDIOMAS}
+    indice = {idioma: {} for idioma in IDIOMAS}
+    with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
+        for linea in archivo:
+            partes = linea.split()
+            if len(partes) < 3:
+                continue
+            idioma = partes[0][:2]
+            palabras = {p.strip().lower() for p in partes[2:]}
+            cartones[idioma][partes[0]] = _CartonCadenas(partes[0], idioma, palabras, partes[1])
+            for palabra in palabras:
+                indice[idioma].setdefault(palabra, []).append(partes[0])
+    return [cartones, indice]
+
+
+def comparar_disposiciones(ruta_archivo: str, repositorio: RepositorioPalabras = None) -> Dict[str, int]:
+    repositorio = repositorio or RepositorioPalabras()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    gestor = GestorBingo(repositorio)
+    gestor.cargar_desde_archivo(ruta_archivo, analizar=False)
+    ids = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del gestor
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    estructuras = _cargar_cadenas(ruta_archivo)
+    cadenas = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del estructuras
+    return {"ids_enteros": ids, "cadenas": cadenas}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte de memoria de cartones e índices")
+    parser.add_argument("cantidad", type=int, nargs="?", default=100000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    repositorio = RepositorioPalabras()
+    descriptor, ruta = tempfile.mkstemp(suffix=".txt")
+    os.close(descriptor)
+    try:
+        generar_cartones(ruta, args.cantidad, args.semilla, repositorio=repositorio)
+        gestor = GestorBingo(repositorio)
+        gestor.cargar_desde_archivo(ruta)
+        print(f"Cartones: {args.cantidad}")
+        for componente, bytes_usados in reporte_memoria(gestor).items():
+            print(f"  {componente:<20} {bytes_usados / 2**20:10.2f} MiB")
+        del gestor
+        comparacion = comparar_disposiciones(ruta, repositorio)
+        print("Memoria retenida tras la carga (tracemalloc):")
+        print(f"  {'IDs enteros':<20} {comparacion['ids_enteros'] / 2**20:10.2f} MiB")
+        print(f"  {'Set[str] por cartón':<20} {comparacion['cadenas'] / 2**20:10.2f} MiB")
+        print(f"  {'Reducción':<20} {1 - comparacion['ids_enteros'] / comparacion['cadenas']:10.1%}")
+    finally:
+        os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
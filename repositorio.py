@@ -1,32 +1,53 @@
 import os
+import bisect
 import random
 from typing import Dict, List, Set, Optional, Tuple
-from constantes import IDIOMAS, RUTA_REPOSITORIO
+from constantes import IDIOMAS, RUTA_REPOSITORIO, ARCHIVOS_REPOSITORIO
 from algoritmos import merge_sort, busqueda_binaria, distancia_edicion
+from vocabulario import Vocabulario
 
 
 class RepositorioPalabras:
     def __init__(self, ruta_base: str = None):
         self.ruta_base = ruta_base or RUTA_REPOSITORIO
+        self.vocabulario: Dict[str, Vocabulario] = {idioma: Vocabulario() for idioma in IDIOMAS}
         self.palabras: Dict[str, List[str]] = {idioma: [] for idioma in IDIOMAS}
-        self.palabras_extraidas: Dict[str, Set[str]] = {idioma: set() for idioma in IDIOMAS}
+        self.palabras_activas: Dict[str, Set[str]] = {idioma: set() for idioma in IDIOMAS}
+        self.palabras_extraidas: Dict[str, Set[int]] = {idioma: set() for idioma in IDIOMAS}
+        self._marcas_tiempo: Dict[str, Tuple[int, int]] = {}
+        self._marcas_pendientes: Dict[str, Tuple[int, int]] = {}
         self._cargar_palabras()
 
+    def _ruta_archivo(self, idioma: str) -> str:
+        return os.path.join(self.ruta_base, ARCHIVOS_REPOSITORIO[idioma])
+
+    def _marca_archivo(self, idioma: str) -> Tuple[int, int]:
+        estado = os.stat(self._ruta_archivo(idioma))
+        return estado.st_mtime_ns, estado.st_size
+
+    def _leer_archivo(self, idioma: str) -> List[str]:
+        ruta = self._ruta_archivo(idioma)
+        marca = self._marca_archivo(idioma)
+        palabras = []
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                linea = linea.strip()
+                if linea and not linea.startswith('#'):
+                    palabras.append(linea.lower())
+        self._marcas_tiempo[idioma] = marca
+        self._marcas_pendientes.pop(idioma, None)
+        return palabras
+
     def _cargar_palabras(self):
-        archivos = {
-            "SP": "palabras_SP.txt",
-            "EN": "palabras_EN.txt",
-            "PT": "palabras_PT.txt",
-            "DT": "palabras_DT.txt"
-        }
-        for idioma, archivo in archivos.items():
-            ruta = os.path.join(self.ruta_base, archivo)
+        for idioma in ARCHIVOS_REPOSITORIO:
+            ruta = self._ruta_archivo(idioma)
+            vocabulario = self.vocabulario[idioma]
             try:
-                with open(ruta, 'r', encoding='utf-8') as f:
-                    for linea in f:
-                        linea = linea.strip()
-                        if linea and not linea.startswith('#'):
-                            self.palabras[idioma].append(linea.lower())
+                for palabra in self._leer_archivo(idioma):
+                    if palabra not in vocabulario:
+                        vocabulario.registrar(palabra)
+                        self.palabras[idioma].append(vocabulario.palabras[-1])
+                self.palabras_activas[idioma].update(self.palabras[idioma])
                 if self.palabras[idioma]:
                     merge_sort(self.palabras[idioma], 0, len(self.palabras[idioma]) - 1)
             except FileNotFoundError:
@@ -34,6 +55,75 @@ class RepositorioPalabras:
             except Exception as e:
                 print(f"Error al cargar {ruta}: {e}")
 
+    def archivos_modificados(self) -> List[str]:
+        modificados = []
+        for idioma in ARCHIVOS_REPOSITORIO:
+            try:
+                marca = self._marca_archivo(idioma)
+            except OSError:
+                continue
+            if marca == self._marcas_tiempo.get(idioma):
+                self._marcas_pendientes.pop(idioma, None)
+            elif marca == self._marcas_pendientes.get(idioma):
+                modificados.append(idioma)
+            else:
+                self._marcas_pendientes[idioma] = marca
+        return modificados
+
+    def _insertar_palabra(self, idioma: str, palabra: str):
+        palabra = self.vocabulario[idioma].decodificar(self.vocabulario[idioma].registrar(palabra))
+        bisect.insort(self.palabras[idioma], palabra)
+        self.palabras_activas[idioma].add(palabra)
+
+    def _eliminar_palabra(self, idioma: str, palabra: str):
+        palabras = self.palabras[idioma]
+        indice = bisect.bisect_left(palabras, palabra)
+        if indice < len(palabras) and palabras[indice] == palabra:
+            del palabras[indice]
+            self.palabras_activas[idioma].discard(palabra)
+            self.palabras_extraidas[idioma].discard(self.vocabulario[idioma].obtener_id(palabra))
+
+    def recargar(self, idioma: str = None,
+                 protegidas: Dict[str, Set[int]] = None) -> Dict[str, Tuple[List[str], List[str]]]:
+        cambios = {}
+        for lang in ([idioma] if idioma else ARCHIVOS_REPOSITORIO):
+            ruta = self._ruta_archivo(lang)
+            try:
+                leidas = set(self._leer_archivo(lang))
+            except FileNotFoundError:
+                print(f"Advertencia: No se encontró {ruta}")
+                continue
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error al recargar {ruta}: {e}")
+                continue
+            actuales = self.palabras_activas[lang]
+            agregadas = sorted(leidas - actuales)
+            eliminadas = sorted(actuales - leidas)
+            if protegidas and protegidas.get(lang):
+                ids = self.vocabulario[lang].ids
+                conservadas = [palabra for palabra in eliminadas if ids[palabra] in protegidas[lang]]
+                if conservadas:
+                    print(f"Advertencia: se conservan {len(conservadas)} palabras de {ruta} presentes en cartones: "
+                          f"{', '.join(conservadas[:5])}")
+                    eliminadas = [palabra for palabra in eliminadas if ids[palabra] not in protegidas[lang]]
+            if agregadas or eliminadas:
+                self.aplicar_cambios(lang, agregadas, eliminadas)
+                cambios[lang] = (agregadas, eliminadas)
+        return cambios
+
+    def aplicar_cambios(self, idioma: str, agregadas: List[str], eliminadas: List[str]):
+        for palabra in eliminadas:
+            self._eliminar_palabra(idioma, palabra)
+        for palabra in agregadas:
+            if palabra not in self.palabras_activas[idioma]:
+                self._insertar_palabra(idioma, palabra)
+
+    def recargar_modificados(self, protegidas: Dict[str, Set[int]] = None) -> Dict[str, Tuple[List[str], List[str]]]:
+        cambios = {}
+        for idioma in self.archivos_modificados():
+            cambios.update(self.recargar(idioma, protegidas))
+        return cambios
+
     def palabra_existe(self, idioma: str, palabra: str) -> bool:
         if idioma not in self.palabras or not self.palabras[idioma]:
             return False
@@ -42,6 +132,11 @@ class RepositorioPalabras:
         indice = busqueda_binaria(self.palabras[idioma], 0, n - 1, palabra)
         return indice != -1
 
+    def obtener_id(self, idioma: str, palabra: str) -> Optional[int]:
+        if not self.palabra_existe(idioma, palabra):
+            return None
+        return self.vocabulario[idioma].obtener_id(palabra.lower().strip())
+
     def sugerir_palabra(self, idioma: str, palabra: str, limite: int = 2) -> Optional[Tuple[str, int]]:
         if idioma not in self.palabras or not self.palabras[idioma]:
             return None
@@ -59,15 +154,17 @@ class RepositorioPalabras:
             return None
         return (mejor_sugerencia, menor_distancia)
 
-    def extraer_palabra(self, idioma: str) -> Optional[str]:
+    def extraer_palabra(self, idioma: str, rng: random.Random = None) -> Optional[str]:
         if idioma not in self.palabras:
             return None
-        disponibles = set(self.palabras[idioma]) - self.palabras_extraidas[idioma]
+        ids = self.vocabulario[idioma].ids
+        extraidas = self.palabras_extraidas[idioma]
+        disponibles = [ids[palabra] for palabra in self.palabras[idioma] if ids[palabra] not in extraidas]
         if not disponibles:
             return None
-        palabra = random.choice(list(disponibles))
-        self.palabras_extraidas[idioma].add(palabra)
-        return palabra
+        id_palabra = (rng or random).choice(disponibles)
+        extraidas.add(id_palabra)
+        return self.vocabulario[idioma].decodificar(id_palabra)
 
     def reiniciar_ronda(self, idioma: str = None):
         if idioma:
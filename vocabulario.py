@@ -0,0 +1,33 @@
+import sys
+from typing import Dict, Iterable, List, Optional
+
+
+class Vocabulario:
+    def __init__(self):
+        self.palabras: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.palabras)
+
+    def __contains__(self, palabra: str) -> bool:
+        return palabra in self.ids
+
+    def registrar(self, palabra: str) -> int:
+        id_palabra = self.ids.get(palabra)
+        if id_palabra is None:
+            palabra = sys.intern(palabra)
+            id_palabra = len(self.palabras)
+            self.palabras.append(palabra)
+            self.ids[palabra] = id_palabra
+        return id_palabra
+
+    def obtener_id(self, palabra: str) -> Optional[int]:
+        return self.ids.get(palabra)
+
+    def decodificar(self, id_palabra: int) -> str:
+        return self.palabras[id_palabra]
+
+    def decodificar_lista(self, ids: Iterable[int]) -> List[str]:
+        palabras = self.palabras
+        return [palabras[id_palabra] for id_palabra in ids]